@@ -77,21 +77,38 @@ def read_books():
 
 def count_books():
     if "engine" not in st.session_state or st.session_state.engine is None:
-        return pd.DataFrame()
+        return 0
     engine = st.session_state.engine
-    return pd.read_sql("SELECT COUNT(*) AS count FROM Books", engine)["count"][0]
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM Books")).scalar_one()
 
 def count_borrowed_books():
     if "engine" not in st.session_state or st.session_state.engine is None:
-        return pd.DataFrame()
+        return 0
     engine = st.session_state.engine
-    return pd.read_sql("SELECT COUNT(*) AS count FROM Loans", engine)["count"][0]
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM Loans")).scalar_one()
 
 def count_overdue_books():
     if "engine" not in st.session_state or st.session_state.engine is None:
-        return pd.DataFrame()
+        return 0
+    engine = st.session_state.engine
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM Loans WHERE DueDate < CURRENT_DATE")).scalar_one()
+
+def dashboard_counts():
+    """Returns (total books, borrowed, overdue) from a single round-trip."""
+    if "engine" not in st.session_state or st.session_state.engine is None:
+        return 0, 0, 0
     engine = st.session_state.engine
-    return pd.read_sql("SELECT COUNT(*) AS count FROM Loans WHERE DueDate < CURRENT_DATE", engine)["count"][0]
+    query = text("""
+        SELECT
+            (SELECT COUNT(*) FROM Books),
+            (SELECT COUNT(*) FROM Loans),
+            (SELECT COUNT(*) FROM Loans WHERE DueDate < CURRENT_DATE)
+    """)
+    with engine.connect() as conn:
+        return tuple(conn.execute(query).one())
 
 def get_borrowed_isbns():
     if "engine" not in st.session_state or st.session_state.engine is None:
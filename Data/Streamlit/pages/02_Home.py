@@ -33,10 +33,8 @@ st.markdown("<h1 style='text-align: center;'>📚 📖 📕 📚 📘 📙 Welco
 
 # --- METRICS ---
 with st.expander("Library Overview", expanded=True):
-    total_books = Read.count_books()
-    borrowed_books = Read.count_borrowed_books()
+    total_books, borrowed_books, overdue_books = Read.dashboard_counts()
     available_books = total_books - borrowed_books
-    overdue_books = Read.count_overdue_books()
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Books", total_books)
     col2.metric("Borrowed", borrowed_books)
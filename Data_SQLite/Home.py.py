@@ -14,12 +14,10 @@ st.set_page_config(
 )
 
 # --- Initialize Session State ---
-for key in ["show_add_book", "show_add_friend", "show_create_loan", "show_return_book"]:
-    if key not in st.session_state:
-        st.session_state[key] = False
+for key in ("show_add_book", "show_add_friend", "show_create_loan", "show_return_book"):
+    st.session_state.setdefault(key, False)
 
-if "db_status" not in st.session_state:
-    st.session_state.db_status = "Connected"
+st.session_state.setdefault("db_status", "Connected")
 
 # --- Sidebar ---
 st.sidebar.title("Liane's Library")
@@ -36,15 +34,17 @@ st.markdown(
 
 # --- Daily Reminders Section ---
 st.subheader("Daily Reminders 🗓️")
-reminders_df = Read.get_daily_reminders()
+reminders = Read.get_daily_reminders()
 
-if reminders_df.empty:
+if not reminders:
     st.info("No reminders for today. All caught up! ✅")
 else:
-    grouped = reminders_df.groupby(['LoanID', 'FriendID', 'FName', 'LName', 'Title', 'DueDate'])
-    st.warning(f"You have {len(grouped)} reminder(s) to send today:")
+    st.warning(f"You have {len(reminders)} reminder(s) to send today:")
+
+    for row in reminders:
+        loan_id, fname, lname, title, due_date = row['LoanID'], row['FName'], row['LName'], row['Title'], row['DueDate']
+        contact_info = row['contacts']
 
-    for (loan_id, friend_id, fname, lname, title, due_date), contacts in grouped:
         # Ensure due_date is a proper datetime object
         if pd.isnull(due_date):
             due_date_str = "unknown due date"
@@ -59,24 +59,19 @@ else:
 
         st.info(f"**{fname} {lname}** needs a reminder about returning **'{title}'**. It's due on **{due_date_str}**.")
         
-        contact_info = contacts[['type', 'contact']].drop_duplicates().reset_index(drop=True)
-
-        contact_cols = st.columns(len(contact_info))
-        for idx, col in enumerate(contact_cols):
-            contact_type = contact_info.iloc[idx]['type']
-            contact_value = contact_info.iloc[idx]['contact']
-            col.metric(label=contact_type.capitalize(), value=contact_value)
+        if not contact_info:
+            st.caption("No contact information on file for this friend.")
+        else:
+            contact_cols = st.columns(len(contact_info))
+            for col, contact in zip(contact_cols, contact_info):
+                col.metric(label=contact['type'].capitalize(), value=contact['contact'])
 
         col1, col2 = st.columns(2)
         with col1:
-            def clear_and_refresh(l_id):
-                if Write.clear_reminder(l_id):
-                    st.cache_data.clear()
-
             st.button(
                 "Clear Reminder",
                 key=f"clear_{loan_id}",
-                on_click=clear_and_refresh,
+                on_click=Write.clear_reminder,
                 args=(loan_id,),
                 use_container_width=True
             )
@@ -102,57 +97,72 @@ col2.button("↪️ Return Book", on_click=set_active_expander, args=("show_retu
 col3.button("📚 Add Book", on_click=set_active_expander, args=("show_add_book",), use_container_width=True)
 col4.button("🧑‍🤝‍🧑 Add Friend", on_click=set_active_expander, args=("show_add_friend",), use_container_width=True)
 
+# --- Quick Action Callbacks ---
+# Writes run as submit callbacks, before the script renders, so every
+# dropdown and reminder below is built from the post-write data
+def submit_create_loan(friend_id_by_display, isbn_by_display):
+    selected_friend_display = st.session_state.home_loan_friend
+    selected_book_display = st.session_state.home_loan_book
+    if not (selected_friend_display and selected_book_display):
+        st.error("Please select both a friend and a book.")
+        return
+    if Write.create_loan_entry(
+        st.session_state.home_loan_borrow_date,
+        st.session_state.home_loan_due_date,
+        st.session_state.home_loan_reminder_date,
+        isbn_by_display[selected_book_display],
+        friend_id_by_display[selected_friend_display]
+    ):
+        st.session_state.success_message = "Loan created successfully!"
+
+def submit_return_book(loan_by_display):
+    selected_loan_display = st.session_state.home_return_loan
+    if not selected_loan_display:
+        st.error("Please select a loan to return.")
+        return
+    selected_loan = loan_by_display[selected_loan_display]
+    if Write.return_book(isbn=selected_loan['ISBN'], friend_id=selected_loan['FriendID']):
+        st.session_state.success_message = "Book return processed successfully!"
+
+def submit_add_book():
+    isbn, title, author, genre = (st.session_state[key] for key in ("home_book_isbn", "home_book_title", "home_book_author", "home_book_genre"))
+    if not all([isbn, title, author, genre]):
+        st.error("Please fill in all required fields.")
+    elif Write.create_book(
+        isbn, title, author, genre,
+        st.session_state.home_book_condition,
+        st.session_state.home_book_shelf_location,
+        int(st.session_state.home_book_shelf_row)
+    ):
+        st.session_state.success_message = f"Book '{title}' added successfully!"
+
 # --- Create Loan Expander ---
 if st.session_state.show_create_loan:
     with st.expander("Create a New Loan", expanded=True):
         with st.form("create_loan_form", clear_on_submit=True):
-            friends_df = Read.get_friends()
-            friend_display_list = friends_df['display'].tolist()
-            selected_friend_display = st.selectbox("Search for a friend", options=friend_display_list, placeholder="Select a friend...")
+            friend_id_by_display = {display: friend_id for friend_id, display in Read.get_friend_options()}
+            st.selectbox("Search for a friend", options=list(friend_id_by_display), placeholder="Select a friend...", key="home_loan_friend")
 
-            books_df = Read.get_books()
-            book_display_list = books_df['display'].tolist()
-            selected_book_display = st.selectbox("Search for an available book", options=book_display_list, placeholder="Select a book...")
+            isbn_by_display = {display: isbn for isbn, display in Read.get_book_options()}
+            st.selectbox("Search for an available book", options=list(isbn_by_display), placeholder="Select a book...", key="home_loan_book")
 
             today = datetime.now().date()
-            borrow_date = st.date_input("Borrow Date", value=today)
-            due_date = st.date_input("Due Date", value=today + timedelta(days=14))
-            reminder_date = st.date_input("Return Reminder Date", value=due_date - timedelta(days=3))
-
-            if st.form_submit_button("Create Loan"):
-                if selected_friend_display and selected_book_display:
-                    selected_friend_id = friends_df[friends_df['display'] == selected_friend_display]['FriendID'].iloc[0]
-                    selected_isbn = books_df[books_df['display'] == selected_book_display]['ISBN'].iloc[0]
-                    if Write.create_loan_entry(borrow_date, due_date, reminder_date, selected_isbn, selected_friend_id):
-                        st.session_state.success_message = "Loan created successfully!"
-                        st.cache_data.clear()
-                        st.experimental_rerun()
-                else:
-                    st.error("Please select both a friend and a book.")
+            st.date_input("Borrow Date", value=today, key="home_loan_borrow_date")
+            due_date = st.date_input("Due Date", value=today + timedelta(days=14), key="home_loan_due_date")
+            st.date_input("Return Reminder Date", value=due_date - timedelta(days=3), key="home_loan_reminder_date")
+
+            st.form_submit_button("Create Loan", on_click=submit_create_loan, args=(friend_id_by_display, isbn_by_display))
 
 # --- Return Book Expander ---
 if st.session_state.show_return_book:
     with st.expander("Return a Book", expanded=True):
         loans_df = Read.list_loans()
         if not loans_df.empty:
-            loans_df['display'] = (
-                "Loan #" + loans_df['LoanID'].astype(str) +
-                ": '" + loans_df['Title'] + "' to " +
-                loans_df['FName'] + " " + loans_df['LName']
-            )
-            loan_display_list = loans_df['display'].tolist()
-            selected_loan_display = st.selectbox("Select the loan to return", options=loan_display_list, placeholder="Select a loan...")
+            loan_by_display = dict(zip(loans_df['display'], loans_df.to_dict('records')))
+            st.selectbox("Select the loan to return", options=list(loan_by_display), placeholder="Select a loan...", key="home_return_loan")
 
             with st.form("return_book_form", clear_on_submit=True):
-                if st.form_submit_button("Confirm Return"):
-                    if selected_loan_display:
-                        selected_loan = loans_df[loans_df['display'] == selected_loan_display].iloc[0]
-                        if Write.return_book(isbn=selected_loan['ISBN'], friend_id=selected_loan['FriendID']):
-                            st.session_state.success_message = "Book return processed successfully!"
-                            st.cache_data.clear()
-                            st.experimental_rerun()
-                    else:
-                        st.error("Please select a loan to return.")
+                st.form_submit_button("Confirm Return", on_click=submit_return_book, args=(loan_by_display,))
         else:
             st.info("There are no active loans to return.")
 
@@ -160,24 +170,15 @@ if st.session_state.show_return_book:
 if st.session_state.show_add_book:
     with st.expander("Add a New Book", expanded=True):
         with st.form("add_book_form", clear_on_submit=True):
-            isbn = st.text_input("ISBN")
-            title = st.text_input("Title")
-            author = st.text_input("Author")
-            genre = st.text_input("Genre")
-            book_condition = st.selectbox("Book Condition", ["Excellent", "Good", "Fair"])
-            shelf_location = st.selectbox("Shelf Location", ["A1", "B1", "C1"])
-            shelf_row = st.selectbox("Row Number", ["1", "2", "3"])
-
-            if st.form_submit_button("💾 Save Book"):
-                if not all([isbn, title, author, genre]):
-                    st.error("Please fill in all required fields.")
-                elif Read.book_exists(isbn):
-                    st.warning(f"A book with ISBN {isbn} already exists.")
-                else:
-                    if Write.create_book(isbn, title, author, genre, book_condition, shelf_location, int(shelf_row)):
-                        st.session_state.success_message = f"Book '{title}' added successfully!"
-                        st.cache_data.clear()
-                        st.experimental_rerun()
+            st.text_input("ISBN", key="home_book_isbn")
+            st.text_input("Title", key="home_book_title")
+            st.text_input("Author", key="home_book_author")
+            st.text_input("Genre", key="home_book_genre")
+            st.selectbox("Book Condition", ["Excellent", "Good", "Fair"], key="home_book_condition")
+            st.selectbox("Shelf Location", ["A1", "B1", "C1"], key="home_book_shelf_location")
+            st.selectbox("Row Number", ["1", "2", "3"], key="home_book_shelf_row")
+
+            st.form_submit_button("💾 Save Book", on_click=submit_add_book)
 
 # --- Add Friend Expander ---
 if st.session_state.show_add_friend:
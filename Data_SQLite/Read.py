@@ -1,227 +1,283 @@
+import json
 import streamlit as st
 import pandas as pd
 from sqlalchemy import (
-    create_engine, select, text, Table, MetaData, and_, func
+    select, text, bindparam, func, Table, MetaData
 )
-from sqlalchemy.engine import Engine
 from typing import Optional
-
-# Centralized engine singleton initializer
-def get_engine() -> Optional[Engine]:
-    if not hasattr(get_engine, "_engine"):
-        import os
-        DB_PATH = os.path.join(os.path.dirname(__file__), "library.db")
-        try:
-            get_engine._engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
-        except Exception as e:
-            st.error(f"Failed to create DB engine: {e}")
-            return None
-    return get_engine._engine
+from datetime import date, timedelta
+from library_connection import get_engine
 
 
 metadata = MetaData()
 engine = get_engine()
 
 # Reflect tables once for reuse
-Books = Table("Books", metadata, autoload_with=engine) if engine else None
-Loans = Table("Loans", metadata, autoload_with=engine) if engine else None
-Friends = Table("Friends", metadata, autoload_with=engine) if engine else None
-Contacts = Table("Contacts", metadata, autoload_with=engine) if engine else None
+Books = Table("Books", metadata, autoload_with=engine)
+Loans = Table("Loans", metadata, autoload_with=engine)
+Friends = Table("Friends", metadata, autoload_with=engine)
+Contacts = Table("Contacts", metadata, autoload_with=engine)
+
+# Raw SQL used on every rerun, built once at import; dates are bound as
+# ISO strings so each statement stays identical from one day to the next
+
+# Every active loan plus an overdue flag; list_loans and get_loan_overdues
+# are both cut from this one result
+LOANS_WITH_FLAGS = text("""
+    SELECT
+        L.LoanID,
+        L.FriendID,
+        F.FName,
+        F.LName,
+        L.BorrowDate,
+        L.DueDate,
+        L.ReturnReminder,
+        B.Title,
+        L.ISBN,
+        'Loan #' || L.LoanID || ': ''' || B.Title || ''' to ' || F.FName || ' ' || F.LName AS display,
+        L.DueDate < :today AS is_overdue
+    FROM Loans L
+    JOIN Books B ON L.ISBN = B.ISBN
+    JOIN Friends F ON L.FriendID = F.FriendID
+""")
+LOAN_EXISTS = text("SELECT EXISTS(SELECT 1 FROM Loans WHERE LoanID = :loan_id)")
+BOOK_EXISTS = text("SELECT EXISTS(SELECT 1 FROM Books WHERE ISBN = :isbn)")
+READ_BOOKS = text("""
+    SELECT 
+        ISBN, 
+        Title, 
+        Author, 
+        Genre, 
+        IsInStock, 
+        BookCondition AS "Condition", 
+        ShelfLocation || ' ' || ShelfRow AS Location 
+    FROM Books 
+    ORDER BY Title
+""")
+COUNT_BOOKS = text("SELECT COUNT(*) FROM Books")
+COUNT_BORROWED_BOOKS = text("SELECT COUNT(*) FROM Loans")
+DASHBOARD_COUNTS = text("""
+    SELECT
+        (SELECT COUNT(*) FROM Books),
+        (SELECT COUNT(*) FROM Loans),
+        (SELECT COUNT(*) FROM Loans WHERE DueDate < :today)
+""")
+COUNT_OVERDUE_BOOKS = text("""
+    SELECT COUNT(*) FROM Loans
+    WHERE DueDate < :today
+""")
+GET_FRIENDS = text("""
+    SELECT
+        FriendID,
+        FName,
+        LName,
+        MaxLoans,
+        FName || ' ' || LName || ' (ID: ' || FriendID || ')' AS display
+    FROM Friends
+    ORDER BY FName, LName
+""")
+GET_BOOKS = text("""
+    SELECT ISBN, Title, Title || ' (ISBN: ' || ISBN || ')' AS display
+    FROM Books
+    WHERE IsInStock = 1
+    ORDER BY Title
+""")
+GET_BORROWED_BOOKS = text("""
+    SELECT B.ISBN, B.Title, B.Title || ' (ISBN: ' || B.ISBN || ')' AS display
+    FROM Loans L
+    JOIN Books B ON L.ISBN = B.ISBN
+    WHERE L.FriendID = :friend_id
+    ORDER BY B.Title
+""")
+GET_LOAN_FRIENDS = text("""
+    SELECT DISTINCT
+        F.FriendID,
+        F.FName,
+        F.LName,
+        F.FName || ' ' || F.LName || ' (ID: ' || F.FriendID || ')' AS display
+    FROM Loans L
+    JOIN Friends F ON L.FriendID = F.FriendID
+    ORDER BY F.FName, F.LName
+""")
+# MaxLoans is the remaining allowance: each loan decrements it and each return
+# gives it back, so open loans are already accounted for. NULL means no limit.
+CAN_BORROW = text("""
+    SELECT MaxLoans IS NULL OR MaxLoans > 0 AS can_borrow
+    FROM Friends
+    WHERE FriendID = :friend_id
+""")
+
+
+# Core selects over the reflected tables, built once at import
+LIST_BOOKS = select(Books)
+READ_ALL_BOOKS = select(Books).order_by(Books.c.Title)
+GET_FRIEND_CONTACT_INFO = select(Contacts).where(Contacts.c.FriendID == bindparam("friend_id"))
+# One row per loan; the friend's distinct contacts, in the order they were
+# added, come back as a JSON array of {"type", "contact"} objects
+_friend_contacts = (
+    select(Contacts.c.type, Contacts.c.contact)
+    .where(Contacts.c.FriendID == Loans.c.FriendID)
+    .group_by(Contacts.c.type, Contacts.c.contact)
+    .order_by(func.min(Contacts.c.ContactID))
+    .correlate(Loans)
+    .subquery()
+)
+GET_DAILY_REMINDERS = select(
+    Loans.c.LoanID,
+    Loans.c.DueDate,
+    Friends.c.FriendID,
+    Friends.c.FName,
+    Friends.c.LName,
+    Books.c.Title,
+    select(
+        func.json_group_array(func.json_object("type", _friend_contacts.c.type, "contact", _friend_contacts.c.contact))
+    ).scalar_subquery().label("contacts")
+).select_from(
+    Loans.join(Friends, Loans.c.FriendID == Friends.c.FriendID)
+         .join(Books, Loans.c.ISBN == Books.c.ISBN)
+).where(
+    # Range on the raw column so idx_loans_reminder can seek instead of scanning
+    (Loans.c.ReturnReminder >= bindparam("today")) & (Loans.c.ReturnReminder < bindparam("tomorrow"))
+)
 
 
-def _get_engine() -> Optional[Engine]:
-    """Get the SQLAlchemy engine or report an error."""
-    eng = get_engine()
-    if eng is None:
-        st.error("Database connection not found.")
-    return eng
+def _df(conn, stmt, params: Optional[dict] = None) -> pd.DataFrame:
+    """Run a query and build a DataFrame straight from the fetched rows."""
+    result = conn.execute(stmt, params or {})
+    return pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def list_books() -> pd.DataFrame:
     """Retrieve all books from the database."""
-    eng = _get_engine()
-    if not eng or Books is None:
-        return pd.DataFrame()
-    stmt = select(Books)
-    with eng.connect() as conn:
-        return pd.read_sql(stmt, conn)
+    with engine.connect() as conn:
+        return _df(conn, LIST_BOOKS)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def loans_with_flags() -> pd.DataFrame:
+    """Retrieve all active loans with friend and book details, a dropdown label and an is_overdue flag."""
+    with engine.connect() as conn:
+        return _df(conn, LOANS_WITH_FLAGS, {"today": date.today().isoformat()})
 
 
 def list_loans() -> pd.DataFrame:
-    """Retrieve all active loans with friend and book details."""
-    eng = _get_engine()
-    if not eng or Loans is None or Books is None or Friends is None:
-        return pd.DataFrame()
-    j = Loans.join(Books, Loans.c.ISBN == Books.c.ISBN).join(Friends, Loans.c.FriendID == Friends.c.FriendID)
-    stmt = select(
-        Loans.c.LoanID,
-        Loans.c.FriendID,
-        Friends.c.FName,
-        Friends.c.LName,
-        Loans.c.BorrowDate,
-        Loans.c.DueDate,
-        Loans.c.ReturnReminder,
-        Books.c.Title,
-        Loans.c.ISBN
-    ).select_from(j)
-    with eng.connect() as conn:
-        return pd.read_sql(stmt, conn)
+    """Retrieve all active loans with friend and book details and a dropdown label."""
+    df = loans_with_flags()
+    return df.drop(columns="is_overdue")
 
 
 def loan_exists(LoanID: int) -> bool:
     """Check if a loan with LoanID exists."""
-    eng = _get_engine()
-    if not eng or Loans is None:
-        return False
-    query = select(Loans.c.LoanID).where(Loans.c.LoanID == LoanID).limit(1)
-    with eng.connect() as conn:
-        return conn.execute(query).fetchone() is not None
+    with engine.connect() as conn:
+        return bool(conn.execute(LOAN_EXISTS, {"loan_id": LoanID}).scalar())
 
 
 def book_exists(isbn: str) -> bool:
     """Check if a book with ISBN exists."""
-    eng = _get_engine()
-    if not eng or Books is None:
-        return False
-    query = select(Books.c.ISBN).where(Books.c.ISBN == isbn).limit(1)
-    with eng.connect() as conn:
-        return conn.execute(query).fetchone() is not None
+    with engine.connect() as conn:
+        return bool(conn.execute(BOOK_EXISTS, {"isbn": isbn}).scalar())
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def read_all_books() -> pd.DataFrame:
     """Read all books ordered by title."""
-    eng = _get_engine()
-    if not eng or Books is None:
-        return pd.DataFrame()
-    stmt = select(Books).order_by(Books.c.Title)
-    with eng.connect() as conn:
-        return pd.read_sql(stmt, conn)
+    with engine.connect() as conn:
+        return _df(conn, READ_ALL_BOOKS)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def read_books() -> pd.DataFrame:
     """Read books with formatted location and condition."""
-    eng = _get_engine()
-    if not eng or Books is None:
-        return pd.DataFrame()
-    query = text("""
-        SELECT 
-            ISBN, 
-            Title, 
-            Author, 
-            Genre, 
-            IsInStock, 
-            BookCondition AS "Condition", 
-            ShelfLocation || ' ' || ShelfRow AS Location 
-        FROM Books 
-        ORDER BY Title
-    """)
-    with eng.connect() as conn:
-        return pd.read_sql(query, conn)
+    with engine.connect() as conn:
+        return _df(conn, READ_BOOKS)
 
 
-def count_borrowed_books() -> int:
-    """Count total borrowed books (loans)."""
-    eng = _get_engine()
-    if not eng or Loans is None:
-        return 0
-    query = select(func.count()).select_from(Loans)
-    with eng.connect() as conn:
-        result = conn.execute(query)
-        return result.scalar_one()
+@st.cache_data(ttl=30, show_spinner=False)
+def count_books() -> int:
+    """Count total books in the library."""
+    with engine.connect() as conn:
+        return conn.execute(COUNT_BOOKS).scalar_one()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def count_borrowed_books() -> int:
     """Count total borrowed books (loans)."""
-    eng = _get_engine()
-    if not eng or Loans is None:
-        return 0
-    query = select([text("COUNT(*)")]).select_from(Loans)
-    with eng.connect() as conn:
-        result = conn.execute(text("SELECT COUNT(*) FROM Loans"))
-        return result.scalar_one()
+    with engine.connect() as conn:
+        return conn.execute(COUNT_BORROWED_BOOKS).scalar_one()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def count_overdue_books() -> int:
-    """Count loans overdue (DueDate < today and not returned)."""
-    eng = _get_engine()
-    if not eng or Loans is None:
-        return 0
-    query = text("""
-        SELECT COUNT(*) FROM Loans
-        WHERE DueDate < date('now') AND Returned = 0
-    """)
-    with eng.connect() as conn:
-        result = conn.execute(query)
-        return result.scalar_one()
+    """Count loans overdue (DueDate < today)."""
+    with engine.connect() as conn:
+        return conn.execute(COUNT_OVERDUE_BOOKS, {"today": date.today().isoformat()}).scalar_one()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def dashboard_counts() -> tuple:
+    """Return (total books, borrowed, overdue) from a single round-trip."""
+    with engine.connect() as conn:
+        return tuple(conn.execute(DASHBOARD_COUNTS, {"today": date.today().isoformat()}).one())
+
+
+@st.cache_data(ttl=30, show_spinner=False)
 def get_friends() -> pd.DataFrame:
     """Fetch all friends with display name."""
-    eng = _get_engine()
-    if not eng or Friends is None:
-        return pd.DataFrame()
-    query = select(Friends).order_by(Friends.c.FName, Friends.c.LName)
     try:
-        with eng.connect() as conn:
-            df = pd.read_sql(query, conn)
-            df['display'] = df['FName'] + ' ' + df['LName'] + ' (ID: ' + df['FriendID'].astype(str) + ')'
-            return df
+        with engine.connect() as conn:
+            return _df(conn, GET_FRIENDS)
     except Exception as e:
         st.error(f"Error fetching friends: {e}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_books() -> pd.DataFrame:
     """Fetch available books with display string."""
-    eng = _get_engine()
-    if not eng or Books is None:
-        return pd.DataFrame()
-    query = select(Books.c.ISBN, Books.c.Title).where(Books.c.IsInStock == 1).order_by(Books.c.Title)
     try:
-        with eng.connect() as conn:
-            df = pd.read_sql(query, conn)
-            df['display'] = df['Title'] + ' (ISBN: ' + df['ISBN'] + ')'
-            return df
+        with engine.connect() as conn:
+            return _df(conn, GET_BOOKS)
     except Exception as e:
         st.error(f"Error fetching available books: {e}")
         return pd.DataFrame()
 
 
+def get_friend_options() -> list:
+    """(FriendID, display) pairs for friend dropdowns, taken from get_friends."""
+    df = get_friends()
+    if df.empty:
+        return []
+    return list(zip(df["FriendID"], df["display"]))
+
+
+def get_book_options() -> list:
+    """(ISBN, display) pairs for available books, taken from get_books."""
+    df = get_books()
+    if df.empty:
+        return []
+    return list(zip(df["ISBN"], df["display"]))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
 def get_borrowed_books(friend_id: int) -> pd.DataFrame:
     """Fetch books borrowed by a friend."""
     if not friend_id:
         return pd.DataFrame()
-    eng = _get_engine()
-    if not eng or Loans is None or Books is None:
-        return pd.DataFrame()
-    j = Loans.join(Books, Loans.c.ISBN == Books.c.ISBN)
-    stmt = select(Books.c.ISBN, Books.c.Title).select_from(j).where(Loans.c.FriendID == friend_id).order_by(Books.c.Title)
     try:
-        with eng.connect() as conn:
-            df = pd.read_sql(stmt, conn)
-            df['display'] = df['Title'] + ' (ISBN: ' + df['ISBN'] + ')'
-            return df
+        with engine.connect() as conn:
+            return _df(conn, GET_BORROWED_BOOKS, {"friend_id": friend_id})
     except Exception as e:
         st.error(f"Error fetching borrowed books: {e}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_loan_friends() -> pd.DataFrame:
     """Fetch unique friends with current loans."""
-    eng = _get_engine()
-    if not eng or Loans is None or Friends is None:
-        return pd.DataFrame()
-    j = Loans.join(Friends, Loans.c.FriendID == Friends.c.FriendID)
-    stmt = select(
-        Friends.c.FriendID,
-        Friends.c.FName,
-        Friends.c.LName
-    ).select_from(j).distinct().order_by(Friends.c.FName, Friends.c.LName)
     try:
-        with eng.connect() as conn:
-            df = pd.read_sql(stmt, conn)
-            df['display'] = df['FName'] + ' ' + df['LName'] + ' (ID: ' + df['FriendID'].astype(str) + ')'
-            return df
+        with engine.connect() as conn:
+            return _df(conn, GET_LOAN_FRIENDS)
     except Exception as e:
         st.error(f"Error fetching friends with loans: {e}")
         return pd.DataFrame()
@@ -229,104 +285,68 @@ def get_loan_friends() -> pd.DataFrame:
 
 def get_loan_overdues() -> pd.DataFrame:
     """Fetch overdue loans with friend and book details."""
-    eng = _get_engine()
-    if not eng or Loans is None or Books is None or Friends is None:
-        return pd.DataFrame()
-    j = Loans.join(Books, Loans.c.ISBN == Books.c.ISBN).join(Friends, Loans.c.FriendID == Friends.c.FriendID)
-    stmt = select(
-        Loans.c.LoanID,
-        Loans.c.DueDate,
-        Friends.c.FriendID,
-        Friends.c.FName,
-        Friends.c.LName,
-        Books.c.Title,
-        Loans.c.ISBN
-    ).select_from(j).where(
-        and_(
-            Loans.c.DueDate < text("date('now')"),
-            Loans.c.Returned == 0
-        )
-    )
-    with eng.connect() as conn:
-        return pd.read_sql(stmt, conn)
+    df = loans_with_flags()
+    overdue = df[df["is_overdue"].astype(bool)]
+    return overdue[["LoanID", "DueDate", "FriendID", "FName", "LName", "Title", "ISBN"]].reset_index(drop=True)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_friend_contact_info(friend_id: int) -> pd.DataFrame:
     """Fetch contact details for a friend."""
     if not friend_id:
         return pd.DataFrame()
-    eng = _get_engine()
-    if not eng or Contacts is None:
-        return pd.DataFrame()
-    query = select(Contacts).where(Contacts.c.FriendID == friend_id)
     try:
-        with eng.connect() as conn:
-            return pd.read_sql(query, conn)
+        with engine.connect() as conn:
+            return _df(conn, GET_FRIEND_CONTACT_INFO, {"friend_id": friend_id})
     except Exception as e:
         st.error(f"Error fetching contact info: {e}")
         return pd.DataFrame()
 
 
-def get_friend_max_loans(friend_id: int) -> Optional[int]:
-    """Fetch MaxLoans value for a friend."""
-    if not friend_id:
-        return None
-    eng = _get_engine()
-    if not eng or Friends is None:
-        return None
-    query = select(Friends.c.MaxLoans).where(Friends.c.FriendID == friend_id).limit(1)
+@st.cache_data(ttl=30, show_spinner=False)
+def get_daily_reminders() -> list:
+    """Fetch loans with reminder date of today, one row dict per loan with a list of contact dicts."""
+    today = date.today()
+    params = {"today": today.isoformat(), "tomorrow": (today + timedelta(days=1)).isoformat()}
     try:
-        with eng.connect() as conn:
-            df = pd.read_sql(query, conn)
-            if not df.empty:
-                return int(df["MaxLoans"].iloc[0])
-            return None
-    except Exception:
-        return None
-
-
-def get_daily_reminders() -> pd.DataFrame:
-    """Fetch loans with reminder date of today."""
-    eng = _get_engine()
-    if not eng or Loans is None or Friends is None or Books is None or Contacts is None:
-        return pd.DataFrame()
-    j = Loans.join(Friends, Loans.c.FriendID == Friends.c.FriendID)\
-             .join(Books, Loans.c.ISBN == Books.c.ISBN)\
-             .join(Contacts, Loans.c.FriendID == Contacts.c.FriendID)
-    stmt = select(
-        Loans.c.LoanID,
-        Loans.c.DueDate,
-        Friends.c.FriendID,
-        Friends.c.FName,
-        Friends.c.LName,
-        Books.c.Title,
-        Contacts.c.type,
-        Contacts.c.contact
-    ).select_from(j).where(
-        text("date(Loans.ReturnReminder) = date('now')")
-    )
-    try:
-        with eng.connect() as conn:
-            return pd.read_sql(stmt, conn)
+        with engine.connect() as conn:
+            return [
+                {**row, "contacts": json.loads(row["contacts"])}
+                for row in conn.execute(GET_DAILY_REMINDERS, params).mappings()
+            ]
     except Exception as e:
         st.error(f"Error fetching reminders: {e}")
-        return pd.DataFrame()
+        return []
 
 
 def can_borrow_more(friend_id: int) -> bool:
     """Check if friend can borrow more books according to MaxLoans."""
-    max_loans = get_friend_max_loans(friend_id)
-    if max_loans is None:
-        return False
-    eng = _get_engine()
-    if not eng or Loans is None:
-        return False
-    query = select(Loans).where(
-        and_(
-            Loans.c.FriendID == friend_id,
-            Loans.c.Returned == 0
-        )
-    )
-    with eng.connect() as conn:
-        current_loans = conn.execute(query).rowcount
-        return current_loans < max_loans
+    with engine.connect() as conn:
+        # None for an unknown friend
+        return bool(conn.execute(CAN_BORROW, {"friend_id": friend_id}).scalar())
+
+
+# Tables each cached reader depends on, so writes only clear what they touch
+_CACHED_READERS = {
+    list_books: {"Books"},
+    loans_with_flags: {"Loans", "Books", "Friends"},
+    read_all_books: {"Books"},
+    read_books: {"Books"},
+    count_books: {"Books"},
+    count_borrowed_books: {"Loans"},
+    count_overdue_books: {"Loans"},
+    dashboard_counts: {"Books", "Loans"},
+    get_friends: {"Friends"},
+    get_books: {"Books"},
+    get_borrowed_books: {"Loans", "Books"},
+    get_loan_friends: {"Loans", "Friends"},
+    get_friend_contact_info: {"Contacts"},
+    get_daily_reminders: {"Loans", "Books", "Friends", "Contacts"},
+}
+
+
+def clear_read_caches(*tables: str) -> None:
+    """Clear the cached readers that depend on any of the given tables (all if none given)."""
+    for reader, depends_on in _CACHED_READERS.items():
+        if not tables or depends_on.intersection(tables):
+            reader.clear()
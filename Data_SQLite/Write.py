@@ -1,75 +1,118 @@
+import functools
 import streamlit as st
-from sqlalchemy import text
+from sqlalchemy import text, bindparam, Date
+from library_connection import get_engine
+import Read
 
-def create_book(isbn, title, author, genre, book_condition, shelf_location, shelf_row, is_in_stock=1):
-    """Inserts a new book into the database."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    query = text("""
-        INSERT INTO Books (ISBN, Title, Author, Genre, BookCondition, IsInStock, ShelfLocation, ShelfRow)
-        VALUES (:isbn, :title, :author, :genre, :book_condition, :is_in_stock, :shelf_location, :shelf_row)
-    """)
+# Multi-table writes: sqlite3 runs one parameterised statement per call, so
+# each is a fixed tuple of statements executed in the caller's transaction.
+# Loan dates are typed so SQLAlchemy renders them as ISO strings itself.
+CREATE_LOAN_SQL = (
+    text("INSERT INTO Loans (BorrowDate, DueDate, ReturnReminder, ISBN, FriendID) VALUES (:borrow_date, :due_date, :return_reminder, :isbn, :friend_id)")
+        .bindparams(bindparam("borrow_date", type_=Date), bindparam("due_date", type_=Date), bindparam("return_reminder", type_=Date)),
+    text("UPDATE Books SET IsInStock = 0 WHERE ISBN = :isbn"),
+    text("UPDATE Friends SET MaxLoans = (MaxLoans - 1) WHERE FriendID = :friend_id"),
+)
+RETURN_BOOK_SQL = (
+    text("DELETE FROM Loans WHERE ISBN = :isbn AND FriendID = :friend_id"),
+    text("UPDATE Books SET IsInStock = 1 WHERE ISBN = :isbn"),
+    text("UPDATE Friends SET MaxLoans = (MaxLoans + 1) WHERE FriendID = :friend_id"),
+)
+DELETE_FRIEND_SQL = (
+    text("DELETE FROM Contacts WHERE FriendID = :friend_id"),
+    text("DELETE FROM Loans WHERE FriendID = :friend_id"),
+    text("DELETE FROM Friends WHERE FriendID = :friend_id"),
+)
+
+# Single-statement writes, compiled once at import
+INSERT_BOOK = text("""
+    INSERT INTO Books (ISBN, Title, Author, Genre, BookCondition, IsInStock, ShelfLocation, ShelfRow)
+    VALUES (:isbn, :title, :author, :genre, :book_condition, :is_in_stock, :shelf_location, :shelf_row)
+    ON CONFLICT(ISBN) DO NOTHING
+""")
+
+UPDATE_BOOK = text("""
+    UPDATE Books SET Title = :title, Author = :author, Genre = :genre, 
+    BookCondition = :book_condition, ShelfLocation = :shelf_location, ShelfRow = :shelf_row
+    WHERE ISBN = :isbn
+""")
+
+DELETE_BOOK = text("DELETE FROM Books WHERE ISBN = :isbn")
+INSERT_FRIEND = text("INSERT INTO Friends (FName, LName, MaxLoans) VALUES (:fname, :lname, :max_loans) RETURNING FriendID")
+INSERT_CONTACT = text("INSERT INTO Contacts (FriendID, type, contact) VALUES (:friend_id, :type, :contact)")
+UPDATE_FRIEND = text("UPDATE Friends SET FName = :fname, LName = :lname, MaxLoans = :max_loans WHERE FriendID = :friend_id")
+DELETE_CONTACT = text("DELETE FROM Contacts WHERE ContactID = :contact_id")
+CLEAR_REMINDER = text("UPDATE Loans SET ReturnReminder = NULL WHERE LoanID = :loan_id")
+
+def invalidate(*tables):
+    """Drops cached query results for the written tables so the next rerun reads fresh data."""
+    Read.clear_read_caches(*tables)
+
+def requires_engine(fn):
+    """Passes the shared engine as the first argument, or reports a missing connection."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        engine = get_engine()
+        if engine is None:
+            st.error("Not connected to the database.")
+            return False
+        return fn(engine, *args, **kwargs)
+    return wrapper
+
+def _run_batch(conn, statements, params):
+    """Executes a fixed batch of statements inside the caller's transaction."""
+    for statement in statements:
+        conn.execute(statement, params)
+
+@requires_engine
+def create_book(engine, isbn, title, author, genre, book_condition, shelf_location, shelf_row, is_in_stock=1):
+    """Inserts a new book into the database; returns False if the ISBN already exists."""
     try:
         with engine.begin() as conn:
-            conn.execute(query, {
+            result = conn.execute(INSERT_BOOK, {
                 "isbn": isbn, "title": title, "author": author, "genre": genre,
                 "book_condition": book_condition, "is_in_stock": is_in_stock,
                 "shelf_location": shelf_location, "shelf_row": shelf_row
             })
+        if result.rowcount != 1:
+            st.warning(f"A book with ISBN {isbn} already exists.")
+            return False
+        invalidate("Books")
         return True
     except Exception as e:
         st.error(f"Failed to create book: {e}")
         return False
 
-def update_book(isbn, title, author, genre, book_condition, shelf_location, shelf_row):
+@requires_engine
+def update_book(engine, isbn, title, author, genre, book_condition, shelf_location, shelf_row):
     """Updates an existing book's details."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    query = text("""
-        UPDATE Books SET Title = :title, Author = :author, Genre = :genre, 
-        BookCondition = :book_condition, ShelfLocation = :shelf_location, ShelfRow = :shelf_row
-        WHERE ISBN = :isbn
-    """)
     try:
         with engine.begin() as conn:
-            conn.execute(query, {
+            conn.execute(UPDATE_BOOK, {
                 "isbn": isbn, "title": title, "author": author, "genre": genre,
                 "book_condition": book_condition, "shelf_location": shelf_location, "shelf_row": shelf_row
             })
+        invalidate("Books")
         return True
     except Exception as e:
         st.error(f"Failed to update book: {e}")
         return False
 
-def delete_book(isbn):
+@requires_engine
+def delete_book(engine, isbn):
     """Deletes a book from the database."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    delete_query = text("DELETE FROM Books WHERE ISBN = :isbn")
     try:
         with engine.begin() as conn:
-            conn.execute(delete_query, {"isbn": isbn})
+            conn.execute(DELETE_BOOK, {"isbn": isbn})
+        invalidate("Books")
         return True
     except Exception as e:
         st.error(f"Failed to delete book: {e}")
         return False
 
-def create_loan_entry(borrow_date, due_date, return_reminder, isbn, friend_id):
+@requires_engine
+def create_loan_entry(engine, borrow_date, due_date, return_reminder, isbn, friend_id):
     """Inserts a new loan and updates the book and friend statuses."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    insert_loan_query = text("INSERT INTO Loans (BorrowDate, DueDate, ReturnReminder, ISBN, FriendID) VALUES (:borrow_date, :due_date, :return_reminder, :isbn, :friend_id)")
-    update_book_status_query = text("UPDATE Books SET IsInStock = 0 WHERE ISBN = :isbn")
-    update_friend_loans_query = text("UPDATE Friends SET MaxLoans = (MaxLoans - 1) WHERE FriendID = :friend_id")
-    
     loan_data = {
         "borrow_date": borrow_date, "due_date": due_date, "return_reminder": return_reminder,
         "isbn": isbn, "friend_id": friend_id
@@ -77,135 +120,101 @@ def create_loan_entry(borrow_date, due_date, return_reminder, isbn, friend_id):
     
     try:
         with engine.begin() as conn:
-            conn.execute(insert_loan_query, loan_data)
-            conn.execute(update_book_status_query, loan_data)
-            conn.execute(update_friend_loans_query, loan_data)
+            _run_batch(conn, CREATE_LOAN_SQL, loan_data)
+        invalidate("Loans", "Books", "Friends")
         return True
     except Exception as e:
         st.error(f"Failed to create loan: {e}")
         return False
 
-def return_book(isbn, friend_id):
+@requires_engine
+def return_book(engine, isbn, friend_id):
     """Processes a book return: deletes the loan and updates book/friend statuses."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    delete_loan_query = text("DELETE FROM Loans WHERE ISBN = :isbn AND FriendID = :friend_id")
-    update_book_status_query = text("UPDATE Books SET IsInStock = 1 WHERE ISBN = :isbn")
-    update_friend_loans_query = text("UPDATE Friends SET MaxLoans = (MaxLoans + 1) WHERE FriendID = :friend_id")
-
     params = {"isbn": isbn, "friend_id": friend_id}
     
     try:
         with engine.begin() as conn:
-            conn.execute(delete_loan_query, params)
-            conn.execute(update_book_status_query, params)
-            conn.execute(update_friend_loans_query, params)
+            _run_batch(conn, RETURN_BOOK_SQL, params)
+        invalidate("Loans", "Books", "Friends")
         return True
     except Exception as e:
         st.error(f"Failed to process return: {e}")
         return False
 
-def add_friend_with_contacts(fname, lname, max_loans, contacts):
+@requires_engine
+def add_friend_with_contacts(engine, fname, lname, max_loans, contacts):
     """Creates a friend and their contact info in a single transaction."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    
-    insert_friend_query = text("INSERT INTO Friends (FName, LName, MaxLoans) VALUES (:fname, :lname, :max_loans)")
-    insert_contact_query = text("INSERT INTO Contacts (FriendID, type, contact) VALUES (:friend_id, :type, :contact)")
-
     try:
         with engine.begin() as conn:
-            result = conn.execute(insert_friend_query, {"fname": fname, "lname": lname, "max_loans": max_loans})
-            friend_id = result.lastrowid
-            valid_contacts = [c for c in contacts if c['type'].strip() and c['contact'].strip()]
-            if valid_contacts:
-                for contact in valid_contacts:
-                    conn.execute(insert_contact_query, {"friend_id": friend_id, "type": contact['type'], "contact": contact['contact']})
+            friend_id = conn.execute(INSERT_FRIEND, {"fname": fname, "lname": lname, "max_loans": max_loans}).scalar_one()
+            rows = [
+                {"friend_id": friend_id, "type": c['type'], "contact": c['contact']}
+                for c in contacts if c['type'].strip() and c['contact'].strip()
+            ]
+            if rows:
+                conn.execute(INSERT_CONTACT, rows)
+        invalidate("Friends", "Contacts")
         return True
     except Exception as e:
         st.error(f"Failed to add friend: {e}")
         return False
 
-def update_friend(friend_id, fname, lname, max_loans):
+@requires_engine
+def update_friend(engine, friend_id, fname, lname, max_loans):
     """Updates a friend's main details."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    query = text("UPDATE Friends SET FName = :fname, LName = :lname, MaxLoans = :max_loans WHERE FriendID = :friend_id")
     try:
         with engine.begin() as conn:
-            conn.execute(query, {"friend_id": friend_id, "fname": fname, "lname": lname, "max_loans": max_loans})
+            conn.execute(UPDATE_FRIEND, {"friend_id": friend_id, "fname": fname, "lname": lname, "max_loans": max_loans})
+        invalidate("Friends")
         return True
     except Exception as e:
         st.error(f"Failed to update friend: {e}")
         return False
 
-def add_contact_to_friend(friend_id, contact_type, contact_info):
+@requires_engine
+def add_contact_to_friend(engine, friend_id, contact_type, contact_info):
     """Adds a new contact to an existing friend."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    query = text("INSERT INTO Contacts (FriendID, type, contact) VALUES (:friend_id, :type, :contact)")
     try:
         with engine.begin() as conn:
-            conn.execute(query, {"friend_id": friend_id, "type": contact_type, "contact": contact_info})
+            conn.execute(INSERT_CONTACT, {"friend_id": friend_id, "type": contact_type, "contact": contact_info})
+        invalidate("Contacts")
         return True
     except Exception as e:
         st.error(f"Failed to add contact: {e}")
         return False
 
-def delete_contact(contact_id):
+@requires_engine
+def delete_contact(engine, contact_id):
     """Deletes a single contact entry."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    query = text("DELETE FROM Contacts WHERE ContactID = :contact_id")
     try:
         with engine.begin() as conn:
-            conn.execute(query, {"contact_id": contact_id})
+            conn.execute(DELETE_CONTACT, {"contact_id": contact_id})
+        invalidate("Contacts")
         return True
     except Exception as e:
         st.error(f"Failed to delete contact: {e}")
         return False
 
-def delete_friend(friend_id):
+@requires_engine
+def delete_friend(engine, friend_id):
     """Deletes a friend and their associated contacts and loans."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to the database.")
-        return False
-    engine = st.session_state.engine
-    
-    delete_contacts_query = text("DELETE FROM Contacts WHERE FriendID = :friend_id")
-    delete_loans_query = text("DELETE FROM Loans WHERE FriendID = :friend_id")
-    delete_friend_query = text("DELETE FROM Friends WHERE FriendID = :friend_id")
     
     try:
         with engine.begin() as conn:
-            conn.execute(delete_contacts_query, {"friend_id": friend_id})
-            conn.execute(delete_loans_query, {"friend_id": friend_id})
-            conn.execute(delete_friend_query, {"friend_id": friend_id})
+            _run_batch(conn, DELETE_FRIEND_SQL, {"friend_id": friend_id})
+        invalidate("Friends", "Contacts", "Loans")
         return True
     except Exception as e:
         st.error(f"Failed to delete friend: {e}.")
         return False
 
-def clear_reminder(loan_id):
+@requires_engine
+def clear_reminder(engine, loan_id):
     """Sets the ReturnReminder to NULL for a given loan to clear it."""
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        st.error("Not connected to database.")
-        return False
-    engine = st.session_state.engine
-    query = text("UPDATE Loans SET ReturnReminder = NULL WHERE LoanID = :loan_id")
     try:
         with engine.begin() as conn:
-            conn.execute(query, {"loan_id": loan_id})
+            conn.execute(CLEAR_REMINDER, {"loan_id": loan_id})
+        invalidate("Loans")
         return True
     except Exception as e:
         st.error(f"Failed to clear reminder: {e}")
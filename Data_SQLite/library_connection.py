@@ -1,10 +1,68 @@
 # library_connection.py
 import os
 import streamlit as st
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
 
+DB_PATH = os.path.join(os.path.dirname(__file__), "library.db")
+
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "foreign_keys=ON",
+)
+
+# One-off schema migrations, run before the indexes below; each must be a
+# no-op once applied
+SQLITE_MIGRATIONS = (
+    # Superseded by idx_books_instock_title_isbn
+    "DROP INDEX IF EXISTS idx_books_instock_title",
+)
+
+# Created once per process when the engine is first built
+SQLITE_INDEXES = (
+    # ISBN rides along so the in-stock book pickers are served from the index alone
+    "CREATE INDEX IF NOT EXISTS idx_books_instock_title_isbn ON Books(IsInStock, Title, ISBN)",
+    "CREATE INDEX IF NOT EXISTS idx_loans_due ON Loans(DueDate)",
+    "CREATE INDEX IF NOT EXISTS idx_loans_friend ON Loans(FriendID)",
+    "CREATE INDEX IF NOT EXISTS idx_loans_isbn ON Loans(ISBN)",
+    "CREATE INDEX IF NOT EXISTS idx_loans_reminder ON Loans(ReturnReminder)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_friend ON Contacts(FriendID)",
+    # Refresh planner statistics so the indexes above actually get picked
+    "ANALYZE",
+)
+
+@st.cache_resource(show_spinner=False)
 def get_engine():
-    if "engine" not in st.session_state or st.session_state.engine is None:
-        DB_PATH = os.path.join(os.path.dirname(__file__), "library.db")
-        st.session_state.engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
-    return st.session_state.engine
\ No newline at end of file
+    """Create one pooled engine per process, shared by every browser session."""
+    engine = create_engine(
+        f"sqlite:///{DB_PATH}",
+        echo=False,
+        future=True,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=-1,
+        # Local file: connections never go stale, so skip the pre-ping round-trip
+        pool_pre_ping=False,
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _):
+        # WAL lets readers keep going while a write transaction is open;
+        # mmap and a larger page cache keep the hot reads off the syscall path
+        cursor = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    with engine.begin() as conn:
+        for statement in SQLITE_MIGRATIONS + SQLITE_INDEXES:
+            conn.exec_driver_sql(statement)
+
+    return engine
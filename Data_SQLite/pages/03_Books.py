@@ -2,19 +2,10 @@ import streamlit as st
 import pandas as pd
 import Read
 import Write
-import library_connection
-
-# --- Initialize DB Engine ---
-engine = library_connection.get_engine()
 
 # --- PAGE CONFIG ---
 st.set_page_config("📚 Manage Books", layout="wide")
 
-# --- Check for Database Engine ---
-if "engine" not in st.session_state or st.session_state.engine is None:
-    st.error("Database connection has not been established. Please start the app from the main Home.py page.")
-    st.stop() # Stop the page from rendering further
-
 # --- Flash Message ---
 if "success_message" in st.session_state:
     st.success(st.session_state.pop("success_message"))
@@ -49,10 +40,7 @@ if selection == "📚 Manage Books":
             if st.form_submit_button("💾 Save Book"):
                 if not all([isbn, title, author, genre]):
                     st.error("Please fill in all required fields.")
-                elif Read.book_exists(isbn):
-                    st.warning(f"A book with ISBN {isbn} already exists.")
-                else:
-                    Write.create_book(isbn, title, author, genre, book_condition, shelf_location, int(shelf_row))
+                elif Write.create_book(isbn, title, author, genre, book_condition, shelf_location, int(shelf_row)):
                     st.session_state.success_message = f"Book '{title}' added successfully!"
                     st.rerun()
 
@@ -126,8 +114,8 @@ if selection == "📚 Manage Books":
                 def delete_book_callback():
                     # The callback also reads from session state
                     book_to_delete = st.session_state.book_to_delete
-                    Write.delete_book(book_to_delete["ISBN"])
-                    st.session_state.success_message = f"Book '{book_to_delete['Title']}' deleted successfully!"
+                    if Write.delete_book(book_to_delete["ISBN"]):
+                        st.session_state.success_message = f"Book '{book_to_delete['Title']}' deleted successfully!"
                     # Clean up session state
                     del st.session_state.book_to_delete
                     del st.session_state.delete_book_select
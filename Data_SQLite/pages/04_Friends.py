@@ -2,19 +2,10 @@ import streamlit as st
 import pandas as pd
 import Read
 import Write
-import library_connection
-
-# --- Initialize DB Engine ---
-engine = library_connection.get_engine()
 
 # --- Page Setup (MUST BE FIRST) ---
 st.set_page_config(layout="wide", page_title="Friends")
 
-# --- Check for Database Engine ---
-if "engine" not in st.session_state or st.session_state.engine is None:
-    st.error("Database connection has not been established. Please start the app from the main Home.py page.")
-    st.stop() # Stop the page from rendering further
-
 # --- Flash Message ---
 if "success_message" in st.session_state:
     st.success(st.session_state.pop("success_message"))
@@ -116,7 +107,6 @@ elif selection == "➕ Add Friend":
             if Write.add_friend_with_contacts(st.session_state.add_fname, st.session_state.add_lname, st.session_state.add_maxloans, final_contacts):
                 st.session_state.success_message = "Friend added successfully!"
                 reset_add_friend_form() 
-                st.cache_data.clear()
 
     # --- Action Buttons ---
     col1, col2 = st.columns(2)
@@ -166,7 +156,6 @@ elif selection == "✏️ Update Friend":
                 if st.form_submit_button("Update Friend Details"):
                     if Write.update_friend(selected_friend_id, FName, LName, MaxLoans):
                         st.session_state.success_message = "Friend details updated successfully!"
-                        st.cache_data.clear()
                         st.rerun()
             
             st.markdown("---")
@@ -180,7 +169,6 @@ elif selection == "✏️ Update Friend":
                     if c3.button("Delete", key=f"del_contact_{row['ContactID']}"):
                         Write.delete_contact(row['ContactID'])
                         st.session_state.success_message = "Contact deleted."
-                        st.cache_data.clear()
                         st.rerun()
             else:
                 st.info("No contacts found for this friend.")
@@ -194,7 +182,6 @@ elif selection == "✏️ Update Friend":
                     if contact_type and contact_info:
                         Write.add_contact_to_friend(selected_friend_id, contact_type, contact_info)
                         st.session_state.success_message = "Contact added."
-                        st.cache_data.clear()
                         st.rerun()
 
 # === Delete Friend ===
@@ -211,6 +198,5 @@ elif selection == "❌ Delete Friend":
             def delete_friend_callback():
                 Write.delete_friend(selected_friend_id)
                 st.session_state.success_message = "Friend deleted successfully!"
-                st.cache_data.clear()
             with st.form("delete_friend_form"):
                 st.form_submit_button("Confirm Delete", on_click=delete_friend_callback, type="primary")
\ No newline at end of file
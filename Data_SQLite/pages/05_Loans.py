@@ -4,19 +4,10 @@ from sqlalchemy import text
 from datetime import datetime, timedelta
 import Read
 import Write
-import library_connection
-
-# --- Initialize DB Engine ---
-engine = library_connection.get_engine()
 
 # --- Page Setup (MUST BE FIRST) ---
 st.set_page_config(layout="wide", page_title="Loans")
 
-# --- Check for Database Engine ---
-if "engine" not in st.session_state or st.session_state.engine is None:
-    st.error("Database connection has not been established. Please start the app from the main Home.py page.")
-    st.stop() # Stop the page from rendering further
-
 # --- Flash Message Display Logic (COMES NEXT) ---
 if "success_message" in st.session_state:
     st.success(st.session_state.success_message)
@@ -40,7 +31,7 @@ if tab_selection == "📖 See Loans":
     try:
         loans_df = Read.list_loans()
         if not loans_df.empty:
-            st.dataframe(loans_df, use_container_width=True)
+            st.dataframe(loans_df.drop(columns="display"), use_container_width=True)
         else:
             st.info("No active loans found in the library.")
     except Exception as e:
@@ -59,12 +50,12 @@ elif tab_selection == "➕ Create Loan":
         # Friend Selection
         friends_df = Read.get_friends()
         if not friends_df.empty:
-            friend_display_list = friends_df['display'].tolist()
+            friend_id_by_display = dict(zip(friends_df['display'], friends_df['FriendID']))
             selected_friend_display_create = st.selectbox(
                 "Search for a friend",
-                options=friend_display_list, index=None, placeholder="Type to search..."
+                options=list(friend_id_by_display), index=None, placeholder="Type to search..."
             )
-            selected_friend_id = friends_df[friends_df['display'] == selected_friend_display_create]['FriendID'].iloc[0] if selected_friend_display_create else None
+            selected_friend_id = friend_id_by_display.get(selected_friend_display_create)
         else:
             st.warning("No friends found.")
             selected_friend_id = None
@@ -72,12 +63,12 @@ elif tab_selection == "➕ Create Loan":
         # Book Selection
         books_df = Read.get_books()
         if not books_df.empty:
-            book_display_list = books_df['display'].tolist()
+            isbn_by_display = dict(zip(books_df['display'], books_df['ISBN']))
             selected_book_display_create = st.selectbox(
                 "Search for an available book",
-                options=book_display_list, index=None, placeholder="Type to search..."
+                options=list(isbn_by_display), index=None, placeholder="Type to search..."
             )
-            selected_isbn = books_df[books_df['display'] == selected_book_display_create]['ISBN'].iloc[0] if selected_book_display_create else None
+            selected_isbn = isbn_by_display.get(selected_book_display_create)
         else:
             st.warning("No available books found.")
             selected_isbn = None
@@ -97,14 +88,12 @@ elif tab_selection == "➕ Create Loan":
                 st.error("Please select both a friend and a book.")
             else:
                 # 2. Now, check the friend's loan limit
-                max_loans = Read.get_friend_max_loans(friend_id=selected_friend_id)
-                if max_loans is not None and max_loans <= 0:
+                if not Read.can_borrow_more(selected_friend_id):
                     st.error("Max Amount Of Loans Was Reached for this friend. Loan not created.")
                 else:
                     # 3. If all checks pass, create the loan
                     if Write.create_loan_entry(borrow_date, due_date, reminder_date, selected_isbn, selected_friend_id):
                         st.session_state.success_message = f"Loan created successfully for {selected_friend_display_create}!"
-                        st.cache_data.clear()
                         st.rerun()
 
 
@@ -121,16 +110,13 @@ elif tab_selection == "↪️ Return Book":
     loans_df = Read.list_loans()
 
     if not loans_df.empty:
-        # Create a user-friendly display column for the dropdown
-        loans_df['display'] = "Loan #" + loans_df['LoanID'].astype(str) + ": '" + loans_df['Title'] + \
-                              "' to " + loans_df['FName'] + " " + loans_df['LName']
-        
-        loan_display_list = loans_df['display'].tolist()
+        # Map each loan's display label to its record for the dropdown
+        loan_by_display = dict(zip(loans_df['display'], loans_df.to_dict('records')))
 
         # Create a single dropdown to select the loan
         selected_loan_display = st.selectbox(
             "Select the loan to return",
-            options=loan_display_list,
+            options=list(loan_by_display),
             index=None,
             placeholder="Select a loan..."
         )
@@ -141,7 +127,7 @@ elif tab_selection == "↪️ Return Book":
             if submitted:
                 if selected_loan_display:
                     # Get the ISBN and FriendID from the selected loan
-                    selected_loan = loans_df[loans_df['display'] == selected_loan_display].iloc[0]
+                    selected_loan = loan_by_display[selected_loan_display]
                     selected_isbn = selected_loan['ISBN']
                     selected_friend_id = selected_loan['FriendID']
 